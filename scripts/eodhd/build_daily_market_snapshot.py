@@ -9,24 +9,38 @@ each run.
 from __future__ import annotations
 
 import argparse
-import io
 import json
 import logging
 import math
 import os
+import random
 import re
+import shutil
 import sqlite3
 import sys
+import tempfile
 import time
 import zipfile
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from heapq import nlargest, nsmallest
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional, Sequence
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request, build_opener
+
+try:
+    import orjson
+except ImportError as exc:
+    raise ImportError(
+        "orjson is required: pip install -r scripts/eodhd/requirements.txt"
+    ) from exc
 
 BULK_LAST_DAY_URL_TEMPLATE = "https://eodhd.com/api/eod-bulk-last-day/{market}"
 USER_AGENT = "portfolio-manager-market-pipeline/1.0"
@@ -36,6 +50,28 @@ DEFAULT_MIN_PRICE = 1.0
 DEFAULT_HISTORY_BACKFILL_DAYS = 365
 TIMEFRAME_LOOKBACK_DAYS: dict[str, int] = {"5D": 7, "1M": 30, "1Y": 365}
 
+# EODHD retry backoff: exponential from the base delay, stretched by up to 50%
+# random jitter so concurrent market fetches do not retry in lockstep.
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+RETRY_JITTER_RATIO = 0.5
+
+# Buffer size for streaming archives between the network, zip and disk.
+STREAM_CHUNK_BYTES = 1 << 20
+
+# Bound-parameter ceiling used to size multi-row INSERT statements. This is
+# SQLite's historical SQLITE_MAX_VARIABLE_NUMBER default, still enforced by
+# builds older than 3.32, so batches stay valid on every runner.
+SQLITE_MAX_BOUND_PARAMETERS = 999
+
+# DEFLATE levels for the published archives. Both stay plain ZIP because the
+# next run and sync_market_snapshot_from_pages.ps1 read them as such. The
+# history archive is the largest download of every run, so it keeps zlib's
+# default level 6; the daily snapshot is rebuilt every run and takes the
+# fastest level.
+HISTORY_DB_ZIP_LEVEL = 6
+DAILY_DB_ZIP_LEVEL = 1
+
 # ----------------------------------------------------------------------------
 # Investor-grade quality filters (defaults).
 #
@@ -123,8 +159,13 @@ class PaymentRequiredError(RuntimeError):
     """Raised when the EODHD API returns HTTP 402 (credits exhausted)."""
 
 
-@dataclass(frozen=True)
-class DailyPriceRow:
+class DailyPriceRow(NamedTuple):
+    """One cleaned bulk-EOD record.
+
+    A NamedTuple rather than a dataclass: tens of thousands are built per run
+    and a plain tuple is smaller and cheaper to construct.
+    """
+
     market_code: str
     market_name: str
     ticker: str
@@ -138,6 +179,28 @@ class DailyPriceRow:
     as_of_date: str
 
 
+_ROW_AS_OF_DATE = itemgetter(DailyPriceRow._fields.index("as_of_date"))
+
+
+def most_common_as_of_date(rows: list[DailyPriceRow]) -> str:
+    """Return the most frequent ``as_of_date`` in ``rows``.
+
+    Single counting pass with no histogram sort; ties resolve to the date seen
+    first, as with ``Counter.most_common``.
+    """
+    # A bulk pull almost always carries one date: confirm that with C-level
+    # passes (field extraction and list.count) before counting in Python.
+    dates = list(map(_ROW_AS_OF_DATE, rows))
+    first_date = dates[0]
+    if dates.count(first_date) == len(dates):
+        return first_date
+
+    counts: dict[str, int] = {}
+    for as_of_date in dates:
+        counts[as_of_date] = counts.get(as_of_date, 0) + 1
+    return max(counts, key=counts.__getitem__)
+
+
 def sanitize_sensitive_text(text: str, secrets: list[str]) -> str:
     sanitized = text
     for secret in secrets:
@@ -182,14 +245,9 @@ def resolve_markets(raw_markets: str) -> list[MarketDefinition]:
     return resolved
 
 
-def parse_iso_date(date_text: str) -> datetime:
-    return datetime.strptime(date_text, "%Y-%m-%d")
-
-
 def iso_days_ago(reference_date: str, days: int) -> str:
-    reference = parse_iso_date(reference_date)
-    target = reference - timedelta(days=days)
-    return target.strftime("%Y-%m-%d")
+    # Plain day-ordinal arithmetic on a date: no datetime or timedelta objects.
+    return date.fromordinal(date.fromisoformat(reference_date).toordinal() - days).isoformat()
 
 
 def parse_args() -> argparse.Namespace:
@@ -296,6 +354,17 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Keep uncompressed SQLite files next to their .zip counterparts.",
     )
+    parser.add_argument(
+        "--zip-compresslevel",
+        type=int,
+        choices=range(0, 10),
+        default=HISTORY_DB_ZIP_LEVEL,
+        metavar="0-9",
+        help=(
+            "DEFLATE level for the history DB archive. Lower is faster but "
+            "produces a larger download for the next run and for GitHub Pages."
+        ),
+    )
     parser.add_argument(
         "--investor-grade-filters",
         action="store_true",
@@ -349,6 +418,13 @@ def parse_float(raw: Any) -> Optional[float]:
     if raw is None:
         return None
 
+    # Fast path: most EODHD numeric fields already decode as JSON floats.
+    if raw.__class__ is float:
+        return raw if math.isfinite(raw) else None
+    # Volumes and integral prices decode as ints; those are always finite.
+    if raw.__class__ is int:
+        return float(raw)
+
     if isinstance(raw, (int, float)):
         value = float(raw)
     elif isinstance(raw, str):
@@ -382,29 +458,55 @@ def parse_int(raw: Any) -> Optional[int]:
 def normalize_date(raw: Any, fallback_date: str) -> str:
     if isinstance(raw, str):
         candidate = raw.strip()[:10]
-        if candidate:
+        # date.fromisoformat is far cheaper than strptime but also accepts the
+        # compact ISO forms, so pin the YYYY-MM-DD shape before validating.
+        if len(candidate) == 10 and candidate[4] == "-" and candidate[7] == "-":
             try:
-                datetime.strptime(candidate, "%Y-%m-%d")
+                date.fromisoformat(candidate)
                 return candidate
             except ValueError:
                 pass
     return fallback_date
 
 
-def extract_change_percent(record: dict[str, Any], close: float) -> Optional[float]:
-    for key in ("change_p", "changePercent", "change_percent", "changesPercentage"):
-        value = parse_float(record.get(key))
-        if value is not None:
-            return value
+# Candidate payload keys, in priority order, for the daily change fields.
+CHANGE_PERCENT_KEYS = ("change_p", "changePercent", "change_percent", "changesPercentage")
+PREVIOUS_CLOSE_KEYS = ("previousClose", "previous_close", "prevClose", "prev_close")
+MARKET_CAP_KEYS = (
+    "market_cap",
+    "marketCap",
+    "market_capitalization",
+    "marketCapitalization",
+    "capitalization",
+)
 
-    previous_close = (
-        parse_float(record.get("previousClose"))
-        or parse_float(record.get("previous_close"))
-        or parse_float(record.get("prevClose"))
-        or parse_float(record.get("prev_close"))
-    )
-    if previous_close not in (None, 0):
-        return (close - previous_close) / previous_close * 100.0
+
+def present_keys(candidates: tuple[str, ...], payload_keys: set[str]) -> tuple[str, ...]:
+    """Keep the candidates that occur in the payload, in priority order."""
+    return tuple(key for key in candidates if key in payload_keys)
+
+
+def extract_change_percent(
+    record: dict[str, Any],
+    close: float,
+    change_percent_keys: tuple[str, ...] = CHANGE_PERCENT_KEYS,
+    previous_close_keys: tuple[str, ...] = PREVIOUS_CLOSE_KEYS,
+) -> Optional[float]:
+    for key in change_percent_keys:
+        raw = record.get(key)
+        if raw is not None:
+            value = parse_float(raw)
+            if value is not None:
+                return value
+
+    # First usable previous close wins; a zero cannot anchor a percentage, so
+    # it falls through to the next key like missing or unparsable values.
+    for key in previous_close_keys:
+        raw = record.get(key)
+        if raw is not None:
+            previous_close = parse_float(raw)
+            if previous_close:
+                return (close - previous_close) / previous_close * 100.0
 
     # Last fallback when only absolute daily change is available.
     absolute_change = parse_float(record.get("change"))
@@ -422,20 +524,79 @@ def extract_change_percent(record: dict[str, Any], close: float) -> Optional[flo
     return None
 
 
-def extract_market_cap(record: dict[str, Any]) -> int:
-    for key in (
-        "market_cap",
-        "marketCap",
-        "market_capitalization",
-        "marketCapitalization",
-        "capitalization",
-    ):
+def extract_market_cap(
+    record: dict[str, Any],
+    market_cap_keys: tuple[str, ...] = MARKET_CAP_KEYS,
+) -> int:
+    for key in market_cap_keys:
         value = parse_int(record.get(key))
         if value is not None and value > 0:
             return value
     return 0
 
 
+# One urllib opener shared by every download. Like urlopen it honours the
+# environment proxy settings and follows redirects; build_opener() only
+# assembles stateless handlers, so worker threads can use it concurrently.
+HTTP_OPENER = build_opener()
+
+
+def http_get(url: str, timeout_seconds: int) -> bytes:
+    """GET ``url`` through :data:`HTTP_OPENER` and return the response body."""
+    request = Request(url, headers={"User-Agent": USER_AGENT})
+    with HTTP_OPENER.open(request, timeout=timeout_seconds) as response:
+        return response.read()
+
+
+def describe_download_error(exc: Exception, target: str, api_key: str) -> str:
+    """Render a failed EODHD download attempt as a log-safe message."""
+    # HTTPError subclasses URLError, so it must be matched first.
+    if isinstance(exc, HTTPError):
+        return (
+            f"HTTP error while downloading EODHD bulk data for {target}: "
+            f"status={exc.code}, reason={exc.reason}"
+        )
+    if isinstance(exc, URLError):
+        safe_reason = sanitize_sensitive_text(str(exc.reason), [api_key])
+        return f"Network error while downloading EODHD bulk data for {target}: {safe_reason}"
+    safe_detail = sanitize_sensitive_text(str(exc), [api_key])
+    if isinstance(exc, (TimeoutError, json.JSONDecodeError, ValueError)):
+        return (
+            f"{exc.__class__.__name__} while downloading EODHD bulk data for "
+            f"{target}: {safe_detail}"
+        )
+    return (
+        f"Unexpected error while downloading EODHD bulk data for {target}: "
+        f"{exc.__class__.__name__}: {safe_detail}"
+    )
+
+
+def parse_retry_after(raw: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if raw is None:
+        return None
+    seconds = parse_float(raw)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        retry_at = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # RFC 9110 HTTP-dates are GMT; parsedate_to_datetime leaves "-0000" naive.
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_delay_seconds(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Backoff before retry ``attempt + 1``, honouring a server Retry-After."""
+    delay = RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1))
+    delay *= 1 + random.uniform(0, RETRY_JITTER_RATIO)
+    if retry_after is not None and retry_after > delay:
+        delay = retry_after
+    return min(delay, RETRY_MAX_DELAY_SECONDS)
+
+
 def fetch_bulk_last_day(
     api_key: str,
     market_code: str,
@@ -454,6 +615,7 @@ def fetch_bulk_last_day(
         f"{BULK_LAST_DAY_URL_TEMPLATE.format(market=market_code)}?{urlencode(params)}"
     )
 
+    target = f"{market_code}{f' ({trading_date})' if trading_date else ''}"
     last_error: Optional[Exception] = None
     for attempt in range(1, max_retries + 1):
         try:
@@ -464,11 +626,9 @@ def fetch_bulk_last_day(
                 attempt,
                 max_retries,
             )
-            request = Request(request_url, headers={"User-Agent": USER_AGENT})
-            with urlopen(request, timeout=timeout_seconds) as response:
-                payload = response.read()
-
-            data = json.loads(payload.decode("utf-8"))
+            # Decode straight from the response bytes so the raw body is not
+            # kept alive next to the decoded rows.
+            data = orjson.loads(http_get(request_url, timeout_seconds))
             if not isinstance(data, list):
                 raise ValueError(f"Unexpected EODHD payload type: {type(data).__name__}")
 
@@ -479,62 +639,28 @@ def fetch_bulk_last_day(
                 len(data),
             )
             return [item for item in data if isinstance(item, dict)]
-        except HTTPError as exc:
-            last_error = RuntimeError(
-                "HTTP error while downloading EODHD bulk data "
-                f"for {market_code}{f' ({trading_date})' if trading_date else ''}: "
-                f"status={exc.code}, reason={exc.reason}"
-            )
-            logger.warning("EODHD request failed: %s", last_error)
-            if exc.code == 402:
-                raise PaymentRequiredError(
-                    f"EODHD API credits exhausted (HTTP 402) while downloading "
-                    f"{market_code}{f' ({trading_date})' if trading_date else ''}. "
-                    f"No retries attempted."
-                ) from exc
-            if attempt < max_retries:
-                wait_seconds = min(5 * attempt, 30)
-                logger.info("Retrying in %s seconds...", wait_seconds)
-                time.sleep(wait_seconds)
-        except URLError as exc:
-            safe_reason = sanitize_sensitive_text(str(exc.reason), [api_key])
-            last_error = RuntimeError(
-                "Network error while downloading EODHD bulk data for "
-                f"{market_code}{f' ({trading_date})' if trading_date else ''}: {safe_reason}"
-            )
-            logger.warning("EODHD request failed: %s", last_error)
-            if attempt < max_retries:
-                wait_seconds = min(5 * attempt, 30)
-                logger.info("Retrying in %s seconds...", wait_seconds)
-                time.sleep(wait_seconds)
-        except (TimeoutError, json.JSONDecodeError, ValueError) as exc:
-            safe_detail = sanitize_sensitive_text(str(exc), [api_key])
-            last_error = RuntimeError(
-                f"{exc.__class__.__name__} while downloading EODHD bulk data for "
-                f"{market_code}{f' ({trading_date})' if trading_date else ''}: {safe_detail}"
-            )
-            logger.warning("EODHD request failed: %s", last_error)
-            if attempt < max_retries:
-                wait_seconds = min(5 * attempt, 30)
-                logger.info("Retrying in %s seconds...", wait_seconds)
-                time.sleep(wait_seconds)
         except Exception as exc:
-            safe_detail = sanitize_sensitive_text(str(exc), [api_key])
-            last_error = RuntimeError(
-                "Unexpected error while downloading EODHD bulk data "
-                f"for {market_code}{f' ({trading_date})' if trading_date else ''}: "
-                f"{exc.__class__.__name__}: {safe_detail}"
-            )
+            last_error = RuntimeError(describe_download_error(exc, target, api_key))
             logger.warning("EODHD request failed: %s", last_error)
+            retry_after: Optional[float] = None
+            if isinstance(exc, HTTPError):
+                if exc.code == 402:
+                    raise PaymentRequiredError(
+                        f"EODHD API credits exhausted (HTTP 402) while downloading "
+                        f"{target}. No retries attempted."
+                    ) from exc
+                # Client errors will not change on retry; 429 is rate limiting.
+                if 400 <= exc.code < 500 and exc.code != 429:
+                    raise last_error from exc
+                if exc.headers is not None:
+                    retry_after = parse_retry_after(exc.headers.get("Retry-After"))
             if attempt < max_retries:
-                wait_seconds = min(5 * attempt, 30)
-                logger.info("Retrying in %s seconds...", wait_seconds)
+                wait_seconds = retry_delay_seconds(attempt, retry_after)
+                logger.info("Retrying in %.1f seconds...", wait_seconds)
                 time.sleep(wait_seconds)
 
     raise RuntimeError(
-        "Unable to download EODHD "
-        f"{market_code}{f' ({trading_date})' if trading_date else ''} "
-        f"bulk data after {max_retries} attempts."
+        f"Unable to download EODHD {target} bulk data after {max_retries} attempts."
     ) from last_error
 
 
@@ -545,11 +671,30 @@ def build_price_rows(
     logger: logging.Logger,
 ) -> list[DailyPriceRow]:
     rows_by_ticker: dict[str, DailyPriceRow] = {}
+    first_valid_index: dict[str, int] = {}
     skipped_rows = 0
     skipped_non_positive_close = 0
     duplicate_tickers = 0
 
-    for row in raw_rows:
+    # Per-market constants are resolved once instead of on every record.
+    market_code = market.code
+    market_name = market.name
+    default_currency = market.default_currency
+
+    # Narrow each candidate key list to the keys this payload actually uses,
+    # so records only probe fields that can match. The union is one C-level
+    # pass over all record keys, so providers that set a field on only some
+    # records are still covered.
+    payload_keys: set[str] = set().union(*raw_rows)
+    change_percent_keys = present_keys(CHANGE_PERCENT_KEYS, payload_keys)
+    previous_close_keys = present_keys(PREVIOUS_CLOSE_KEYS, payload_keys)
+    market_cap_keys = present_keys(MARKET_CAP_KEYS, payload_keys)
+
+    # Walk the payload backwards: the last valid record of a ticker wins, so
+    # once it is accepted, earlier duplicates only get the ticker/close checks
+    # that keep the counters exact, not the full field parsing.
+    for index in range(len(raw_rows) - 1, -1, -1):
+        row = raw_rows[index]
         ticker_raw = row.get("code") or row.get("symbol") or row.get("ticker")
         ticker = str(ticker_raw).strip().upper() if ticker_raw is not None else ""
         close = parse_float(row.get("close"))
@@ -560,6 +705,10 @@ def build_price_rows(
         if close <= 0:
             skipped_non_positive_close += 1
             continue
+        first_valid_index[ticker] = index
+        if ticker in rows_by_ticker:
+            duplicate_tickers += 1
+            continue
 
         security_name = (row.get("name") or row.get("short_name") or ticker)
         normalized_name = str(security_name).strip() if security_name is not None else ticker
@@ -567,24 +716,20 @@ def build_price_rows(
             normalized_name = ticker
 
         currency_raw = row.get("currency")
-        normalized_currency = (
-            str(currency_raw).strip().upper()
-            if currency_raw is not None and str(currency_raw).strip()
-            else market.default_currency
-        )
+        currency_text = str(currency_raw).strip() if currency_raw is not None else ""
+        normalized_currency = currency_text.upper() if currency_text else default_currency
 
         volume = max(parse_int(row.get("volume")) or 0, 0)
         dollar_volume = close * volume
-        market_cap = extract_market_cap(row)
+        market_cap = extract_market_cap(row, market_cap_keys)
         as_of_date = normalize_date(row.get("date"), fallback_date)
-        change_percent = extract_change_percent(row, close)
-
-        if ticker in rows_by_ticker:
-            duplicate_tickers += 1
+        change_percent = extract_change_percent(
+            row, close, change_percent_keys, previous_close_keys
+        )
 
         rows_by_ticker[ticker] = DailyPriceRow(
-            market_code=market.code,
-            market_name=market.name,
+            market_code=market_code,
+            market_name=market_name,
             ticker=ticker,
             name=normalized_name,
             currency=normalized_currency,
@@ -596,7 +741,15 @@ def build_price_rows(
             as_of_date=as_of_date,
         )
 
-    cleaned_rows = list(rows_by_ticker.values())
+    # Emit tickers in the order of their first valid record, as a forward pass
+    # would; without duplicates that is simply the reverse of the walk.
+    if duplicate_tickers:
+        cleaned_rows = [
+            rows_by_ticker[ticker]
+            for ticker in sorted(first_valid_index, key=first_valid_index.__getitem__)
+        ]
+    else:
+        cleaned_rows = list(reversed(rows_by_ticker.values()))
 
     logger.info(
         "Rows prepared for SQLite [%s]. Valid unique: %s | Skipped invalid: %s | "
@@ -614,17 +767,101 @@ def build_price_rows(
     return cleaned_rows
 
 
-def write_sqlite_snapshot(
-    db_path: Path,
-    rows: list[DailyPriceRow],
-    markets: list[MarketDefinition],
+# Upper bound on concurrent per-market downloads; EODHD bulk calls are heavy,
+# so a long --markets list is fetched in waves instead of all at once.
+MAX_MARKET_FETCH_WORKERS = 8
+
+# Concurrent read-only history connections used while ranking top movers.
+# Only the SQLite reads overlap; the ranking itself holds the GIL, so more
+# threads than this would just queue.
+MAX_HISTORY_READ_WORKERS = 4
+
+
+def fetch_market_rows(
+    market: MarketDefinition,
+    api_key: str,
+    fallback_date: str,
+    timeout_seconds: int,
+    max_retries: int,
     logger: logging.Logger,
+    trading_date: Optional[str] = None,
+) -> list[DailyPriceRow]:
+    """Download and parse one market's bulk payload (latest or ``trading_date``).
+
+    Runs as a thread-pool task, so each payload is decoded and cleaned as soon
+    as its own response arrives rather than after the slowest download.
+    """
+    raw_rows = fetch_bulk_last_day(
+        api_key=api_key,
+        market_code=market.code,
+        timeout_seconds=timeout_seconds,
+        max_retries=max_retries,
+        logger=logger,
+        trading_date=trading_date,
+    )
+    return build_price_rows(
+        market=market,
+        raw_rows=raw_rows,
+        fallback_date=fallback_date,
+        logger=logger,
+    )
+
+
+def insert_rows_batched(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    conflict_clause: str = "",
 ) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    if db_path.exists():
-        db_path.unlink()
+    """Insert ``rows`` using compound ``VALUES (...), (...)`` statements.
+
+    Each statement carries as many rows as fit under
+    :data:`SQLITE_MAX_BOUND_PARAMETERS`, so parameter binding and VDBE entry
+    happen once per batch instead of once per row. The remainder goes through
+    the single-row form of the same statement.
+    """
+    if not rows:
+        return
+
+    column_list = ", ".join(columns)
+    row_placeholders = "(" + ", ".join("?" * len(columns)) + ")"
+    batch_size = max(SQLITE_MAX_BOUND_PARAMETERS // len(columns), 1)
+    batched_count = len(rows) - len(rows) % batch_size
 
-    with sqlite3.connect(db_path) as connection:
+    if batched_count:
+        conn.executemany(
+            f"INSERT INTO {table} ({column_list}) "
+            f"VALUES {', '.join([row_placeholders] * batch_size)} {conflict_clause}",
+            (
+                list(chain.from_iterable(rows[start:start + batch_size]))
+                for start in range(0, batched_count, batch_size)
+            ),
+        )
+    if batched_count < len(rows):
+        conn.executemany(
+            f"INSERT INTO {table} ({column_list}) "
+            f"VALUES {row_placeholders} {conflict_clause}",
+            rows[batched_count:],
+        )
+
+
+def build_snapshot_db(
+    rows: list[DailyPriceRow],
+    markets: list[MarketDefinition],
+    generated_at_utc: str,
+) -> sqlite3.Connection:
+    """Build the daily snapshot tables in a private in-memory database.
+
+    The snapshot is rebuilt from scratch on every run, so it is loaded under
+    one explicit transaction with no on-disk journal at all; callers decide
+    how the finished image reaches disk.
+    """
+    connection = sqlite3.connect(":memory:", isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode=MEMORY")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("BEGIN IMMEDIATE")
         connection.execute(
             """
             CREATE TABLE daily_prices (
@@ -643,14 +880,27 @@ def write_sqlite_snapshot(
             )
             """
         )
-        connection.execute(
-            "CREATE INDEX idx_daily_prices_market_code ON daily_prices(market_code)"
+        # daily_prices mirrors DailyPriceRow field for field, so the rows are
+        # bound as-is with no per-row repacking.
+        insert_rows_batched(
+            connection,
+            table="daily_prices",
+            columns=DailyPriceRow._fields,
+            rows=rows,
         )
+
+        # Secondary indexes are built once over the loaded table instead of
+        # being maintained row by row during the bulk insert. Lookups by
+        # market_code alone are served by the primary key's leading column.
         connection.execute(
             "CREATE INDEX idx_daily_prices_as_of_date ON daily_prices(as_of_date)"
         )
+        # Movers are ranked per market, and rows without a change are never
+        # ranked, so they are left out of the index entirely.
         connection.execute(
-            "CREATE INDEX idx_daily_prices_change_percent ON daily_prices(change_percent)"
+            "CREATE INDEX idx_daily_prices_market_change_percent "
+            "ON daily_prices(market_code, change_percent) "
+            "WHERE change_percent IS NOT NULL"
         )
         connection.execute(
             "CREATE INDEX idx_daily_prices_market_cap ON daily_prices(market_cap)"
@@ -659,41 +909,6 @@ def write_sqlite_snapshot(
             "CREATE INDEX idx_daily_prices_dollar_volume ON daily_prices(dollar_volume)"
         )
 
-        connection.executemany(
-            """
-            INSERT INTO daily_prices (
-                market_code,
-                market_name,
-                ticker,
-                name,
-                currency,
-                close,
-                volume,
-                dollar_volume,
-                market_cap,
-                change_percent,
-                as_of_date
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                (
-                    r.market_code,
-                    r.market_name,
-                    r.ticker,
-                    r.name,
-                    r.currency,
-                    r.close,
-                    r.volume,
-                    r.dollar_volume,
-                    r.market_cap,
-                    r.change_percent,
-                    r.as_of_date,
-                )
-                for r in rows
-            ),
-        )
-
         serialized_markets = ",".join(market.code for market in markets)
 
         connection.execute(
@@ -709,17 +924,53 @@ def write_sqlite_snapshot(
             [
                 ("markets", serialized_markets),
                 ("source", "EODHD_BULK_LAST_DAY"),
-                ("generated_at_utc", datetime.now(timezone.utc).isoformat()),
+                ("generated_at_utc", generated_at_utc),
                 ("rows", str(len(rows))),
                 ("market_count", str(len(markets))),
             ],
         )
-        connection.commit()
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def serialize_snapshot_db(
+    rows: list[DailyPriceRow],
+    markets: list[MarketDefinition],
+    generated_at_utc: str,
+) -> bytes:
+    """Return the daily snapshot as a complete SQLite file image.
+
+    The image is built once per run; it is copied into the history DB and
+    written to the archive as-is, so the rows are bound into SQLite only once.
+    """
+    with closing(
+        build_snapshot_db(rows=rows, markets=markets, generated_at_utc=generated_at_utc)
+    ) as connection:
+        return connection.serialize()
+
+
+def write_sqlite_snapshot(
+    db_path: Path,
+    snapshot_image: bytes,
+    logger: logging.Logger,
+) -> None:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # The serialized image is byte-for-byte a database file, written in one
+    # sequential pass instead of journaling and syncing page writes on disk.
+    db_path.write_bytes(snapshot_image)
 
     logger.info("SQLite snapshot generated: %s", db_path)
 
 
-def compress_file(source_path: Path, zip_path: Path, logger: logging.Logger) -> None:
+def compress_file(
+    source_path: Path,
+    zip_path: Path,
+    logger: logging.Logger,
+    compresslevel: int = HISTORY_DB_ZIP_LEVEL,
+) -> None:
     if zip_path.exists():
         zip_path.unlink()
 
@@ -727,13 +978,48 @@ def compress_file(source_path: Path, zip_path: Path, logger: logging.Logger) ->
         zip_path,
         mode="w",
         compression=zipfile.ZIP_DEFLATED,
-        compresslevel=9,
+        compresslevel=compresslevel,
     ) as archive:
         archive.write(source_path, arcname=source_path.name)
 
     logger.info("Compressed file generated: %s", zip_path)
 
 
+def write_snapshot_archive(
+    db_path: Path,
+    zip_path: Path,
+    snapshot_image: bytes,
+    logger: logging.Logger,
+    keep_uncompressed_db: bool = True,
+) -> None:
+    """Write the daily snapshot ZIP archive, plus the bare DB when it is kept.
+
+    Without ``keep_uncompressed_db`` the serialized image goes straight into
+    the archive, so no intermediate ``.db`` file is written, read back and
+    then deleted.
+    """
+    if keep_uncompressed_db:
+        write_sqlite_snapshot(db_path=db_path, snapshot_image=snapshot_image, logger=logger)
+        compress_file(
+            source_path=db_path,
+            zip_path=zip_path,
+            logger=logger,
+            compresslevel=DAILY_DB_ZIP_LEVEL,
+        )
+        return
+
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(
+        zip_path,
+        mode="w",
+        compression=zipfile.ZIP_DEFLATED,
+        compresslevel=DAILY_DB_ZIP_LEVEL,
+    ) as archive:
+        archive.writestr(db_path.name, snapshot_image)
+
+    logger.info("SQLite snapshot archived without an uncompressed copy: %s", zip_path)
+
+
 # ---------------------------------------------------------------------------
 # Rolling history DB helpers
 # ---------------------------------------------------------------------------
@@ -748,27 +1034,85 @@ def fetch_history_db(
     url = history_url.strip()
     if not url or db_path.exists():
         return
+    partial_path = db_path.with_name(f"{db_path.name}.part")
     try:
         logger.info("Fetching existing rolling history DB from %s", url)
         req = Request(url, headers={"User-Agent": USER_AGENT})
-        with urlopen(req, timeout=timeout_seconds) as resp:
-            data = resp.read()
-        with zipfile.ZipFile(io.BytesIO(data)) as zf:
-            entry = next(
-                (n for n in zf.namelist() if n.lower().endswith(".db")), None
-            )
-            if entry is None:
-                raise RuntimeError("No .db file found in history archive.")
-            db_path.parent.mkdir(parents=True, exist_ok=True)
-            with zf.open(entry) as src, db_path.open("wb") as dst:
-                dst.write(src.read())
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Stream archive and extracted DB through disk in fixed-size chunks;
+        # neither the archive nor the DB is ever held in memory.
+        with tempfile.TemporaryFile(dir=db_path.parent) as archive_file:
+            with HTTP_OPENER.open(req, timeout=timeout_seconds) as resp:
+                shutil.copyfileobj(resp, archive_file, STREAM_CHUNK_BYTES)
+            with zipfile.ZipFile(archive_file) as zf:
+                entry = next(
+                    (n for n in zf.namelist() if n.lower().endswith(".db")), None
+                )
+                if entry is None:
+                    raise RuntimeError("No .db file found in history archive.")
+                # Extract next to the target and rename only once complete, so
+                # an interrupted transfer never leaves a truncated DB that the
+                # "start fresh" path would then try to open.
+                with zf.open(entry) as src, partial_path.open("wb") as dst:
+                    shutil.copyfileobj(src, dst, STREAM_CHUNK_BYTES)
+        os.replace(partial_path, db_path)
         logger.info("Rolling history DB fetched: %s", db_path)
     except Exception as exc:
+        partial_path.unlink(missing_ok=True)
         logger.warning(
             "Could not fetch rolling history DB (will start fresh): %s", exc
         )
 
 
+# Map up to this many bytes of the history DB into memory so index and table
+# reads come straight from the page cache instead of read() syscalls.
+HISTORY_DB_MMAP_BYTES = 256 * 1024 * 1024
+# Page cache for the history writer connection (KiB), sized so a market's
+# index and table pages stay cached across the upsert, backfill and anchor
+# steps.
+HISTORY_DB_CACHE_KIB = 128 * 1024
+# The top-movers reads (history depth and per-timeframe references) run on
+# up to MAX_HISTORY_READ_WORKERS read-only connections; each gets an equal
+# share of the same budget rather than SQLite's ~2 MB default.
+HISTORY_DB_READER_CACHE_KIB = HISTORY_DB_CACHE_KIB // MAX_HISTORY_READ_WORKERS
+# Page size for a history DB created from scratch. SQLite ignores it once the
+# file has tables, so existing databases keep theirs until rebuilt.
+HISTORY_DB_PAGE_SIZE = 8192
+# Prepared-statement cache for the history connection (sqlite3 default: 128).
+HISTORY_DB_CACHED_STATEMENTS = 256
+
+
+def connect_history_db(db_path: Path) -> sqlite3.Connection:
+    """Open the single history writer connection used for the whole run.
+
+    Every history write helper takes this connection and issues fixed SQL strings,
+    so the enlarged statement cache keeps each one prepared across markets
+    and backfill days instead of recompiling it.
+    """
+    conn = sqlite3.connect(db_path, cached_statements=HISTORY_DB_CACHED_STATEMENTS)
+    conn.execute(f"PRAGMA page_size={HISTORY_DB_PAGE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size={HISTORY_DB_MMAP_BYTES}")
+    conn.execute(f"PRAGMA cache_size=-{HISTORY_DB_CACHE_KIB}")
+    # The file is a throwaway CI working copy that is re-zipped at the end of
+    # the run, so commits need not pay for a full fsync each.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def connect_history_reader(db_path: Path) -> sqlite3.Connection:
+    """Open a read-only history connection for use on a worker thread."""
+    conn = sqlite3.connect(
+        f"{db_path.resolve().as_uri()}?mode=ro",
+        uri=True,
+        cached_statements=HISTORY_DB_CACHED_STATEMENTS,
+    )
+    conn.execute(f"PRAGMA mmap_size={HISTORY_DB_MMAP_BYTES}")
+    conn.execute(f"PRAGMA cache_size=-{HISTORY_DB_READER_CACHE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
 def ensure_history_schema(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
@@ -841,49 +1185,62 @@ def ensure_history_schema(conn: sqlite3.Connection) -> None:
     )
 
 
+# history_prices columns in INSERT order (the history table has no
+# market_name); HISTORY_ROW_VALUES picks them from a DailyPriceRow in C.
+HISTORY_COLUMNS = (
+    "market_code",
+    "ticker",
+    "name",
+    "currency",
+    "close",
+    "volume",
+    "dollar_volume",
+    "market_cap",
+    "change_percent",
+    "as_of_date",
+)
+HISTORY_ROW_VALUES = itemgetter(*(DailyPriceRow._fields.index(c) for c in HISTORY_COLUMNS))
+
+HISTORY_UPSERT_CLAUSE = """
+    ON CONFLICT(market_code, ticker, as_of_date)
+    DO UPDATE SET
+        name = excluded.name,
+        currency = excluded.currency,
+        close = excluded.close,
+        volume = excluded.volume,
+        dollar_volume = excluded.dollar_volume,
+        market_cap = excluded.market_cap,
+        change_percent = excluded.change_percent
+"""
+
+
 def upsert_history_rows(conn: sqlite3.Connection, rows: list[DailyPriceRow]) -> None:
-    if not rows:
-        return
-    conn.executemany(
-        """
-        INSERT INTO history_prices (
-            market_code,
-            ticker,
-            name,
-            currency,
-            close,
-            volume,
-            dollar_volume,
-            market_cap,
-            change_percent,
-            as_of_date
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(market_code, ticker, as_of_date)
-        DO UPDATE SET
-            name = excluded.name,
-            currency = excluded.currency,
-            close = excluded.close,
-            volume = excluded.volume,
-            dollar_volume = excluded.dollar_volume,
-            market_cap = excluded.market_cap,
-            change_percent = excluded.change_percent
-        """,
-        [
-            (
-                row.market_code,
-                row.ticker,
-                row.name,
-                row.currency,
-                row.close,
-                row.volume,
-                row.dollar_volume,
-                row.market_cap,
-                row.change_percent,
-                row.as_of_date,
-            )
-            for row in rows
-        ],
+    insert_rows_batched(
+        conn,
+        table="history_prices",
+        columns=HISTORY_COLUMNS,
+        rows=list(map(HISTORY_ROW_VALUES, rows)),
+        conflict_clause=HISTORY_UPSERT_CLAUSE,
+    )
+
+
+def upsert_history_from_snapshot(conn: sqlite3.Connection, snapshot_image: bytes) -> None:
+    """Upsert every daily snapshot row into ``history_prices`` inside SQLite.
+
+    The snapshot image is attached as an in-memory schema and copied with a
+    single ``INSERT ... SELECT``, so the rows already bound for the snapshot
+    are not shipped through Python a second time. Nothing is committed here.
+    SQLite cannot detach a schema mid-transaction, so the image stays
+    attached until the connection is closed.
+    """
+    column_list = ", ".join(HISTORY_COLUMNS)
+    conn.execute("ATTACH DATABASE ':memory:' AS snapshot")
+    conn.deserialize(snapshot_image, name="snapshot")
+    # "WHERE true" keeps SQLite from parsing ON CONFLICT as a join clause.
+    conn.execute(
+        f"INSERT INTO history_prices ({column_list}) "
+        f"SELECT {column_list} FROM snapshot.daily_prices WHERE true "
+        f"{HISTORY_UPSERT_CLAUSE}"
     )
 
 
@@ -904,16 +1261,17 @@ def has_history_market_date(
     return row is not None
 
 
-def iso_date_range(start_date: str, end_date: str) -> list[str]:
-    start = parse_iso_date(start_date)
-    end = parse_iso_date(end_date)
+def date_range(start_date: str, end_date: str) -> list[date]:
+    """Calendar days from ``start_date`` to ``end_date`` inclusive, as dates.
+
+    Returned as ``date`` objects so callers can test the weekday without
+    re-parsing each ISO string.
+    """
+    start = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
     if end < start:
         return []
-    days = (end - start).days
-    return [
-        (start + timedelta(days=offset)).strftime("%Y-%m-%d")
-        for offset in range(days + 1)
-    ]
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
 
 
 def backfill_history_window(
@@ -929,15 +1287,22 @@ def backfill_history_window(
     if history_backfill_days <= 0:
         return
 
+    # Plan the missing weekdays of every market first, then download them
+    # concurrently. Only the HTTP calls run on the pool: rows are written to
+    # SQLite on this thread as each response completes.
+    windows: dict[str, tuple[str, str]] = {}
+    stats: dict[str, dict[str, int]] = {}
+    pending: list[tuple[MarketDefinition, str]] = []
     for market in markets:
         market_rows = rows_by_market.get(market.code, [])
         if not market_rows:
             continue
 
-        reference_date = Counter(
-            row.as_of_date for row in market_rows
-        ).most_common(1)[0][0]
+        reference_date = most_common_as_of_date(market_rows)
         window_start = iso_days_ago(reference_date, max(history_backfill_days - 1, 0))
+        windows[market.code] = (window_start, reference_date)
+        market_stats = {"fetched_days": 0, "inserted_rows": 0, "skipped_days": 0}
+        stats[market.code] = market_stats
 
         existing_dates = {
             str(row[0])
@@ -953,99 +1318,195 @@ def backfill_history_window(
             )
         }
 
-        fetched_days = 0
-        inserted_rows = 0
-        skipped_days = 0
-
-        for candidate_date in iso_date_range(window_start, reference_date):
+        for candidate_day in date_range(window_start, reference_date):
+            candidate_date = candidate_day.isoformat()
             if candidate_date in existing_dates:
                 continue
 
             # Most exchanges are closed on Saturday/Sunday.
-            if parse_iso_date(candidate_date).weekday() >= 5:
-                skipped_days += 1
+            if candidate_day.weekday() >= 5:
+                market_stats["skipped_days"] += 1
                 continue
 
-            try:
-                raw_data = fetch_bulk_last_day(
+            pending.append((market, candidate_date))
+
+    if pending:
+        aborted_markets: set[str] = set()
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_MARKET_FETCH_WORKERS, len(pending))
+        ) as executor:
+            futures = {
+                executor.submit(
+                    fetch_market_rows,
+                    market=market,
                     api_key=api_key,
-                    market_code=market.code,
+                    fallback_date=candidate_date,
                     timeout_seconds=timeout_seconds,
                     max_retries=max_retries,
                     logger=logger,
                     trading_date=candidate_date,
-                )
-                backfill_rows = build_price_rows(
-                    market=market,
-                    raw_rows=raw_data,
-                    fallback_date=candidate_date,
-                    logger=logger,
-                )
-            except PaymentRequiredError:
-                logger.error(
-                    "API credits exhausted during backfill [%s %s]. "
-                    "Aborting remaining dates for this market.",
-                    market.code,
-                    candidate_date,
-                )
-                break
-            except Exception as exc:
-                skipped_days += 1
-                safe_detail = sanitize_sensitive_text(str(exc), [api_key])
-                logger.info(
-                    "History backfill skipped [%s %s]: %s",
-                    market.code,
-                    candidate_date,
-                    safe_detail,
-                )
-                continue
+                ): (market, candidate_date)
+                for market, candidate_date in pending
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                market, candidate_date = futures[future]
+                market_stats = stats[market.code]
+                try:
+                    backfill_rows = future.result()
+                except PaymentRequiredError:
+                    if market.code not in aborted_markets:
+                        aborted_markets.add(market.code)
+                        logger.error(
+                            "API credits exhausted during backfill [%s %s]. "
+                            "Aborting remaining dates for this market.",
+                            market.code,
+                            candidate_date,
+                        )
+                        for other, (other_market, _) in futures.items():
+                            if other_market is market:
+                                other.cancel()
+                    continue
+                except Exception as exc:
+                    market_stats["skipped_days"] += 1
+                    safe_detail = sanitize_sensitive_text(str(exc), [api_key])
+                    logger.info(
+                        "History backfill skipped [%s %s]: %s",
+                        market.code,
+                        candidate_date,
+                        safe_detail,
+                    )
+                    continue
 
-            upsert_history_rows(conn, backfill_rows)
-            conn.commit()
-            existing_dates.add(candidate_date)
-            fetched_days += 1
-            inserted_rows += len(backfill_rows)
+                upsert_history_rows(conn, backfill_rows)
+                market_stats["fetched_days"] += 1
+                market_stats["inserted_rows"] += len(backfill_rows)
+
+        # Backfilled days are not committed individually: the caller commits
+        # the whole history update as a single transaction.
 
+    for market_code, (window_start, reference_date) in windows.items():
+        market_stats = stats[market_code]
         logger.info(
             "History backfill complete [%s]. Window=%s..%s | fetched_days=%d | inserted_rows=%d | skipped_days=%d",
-            market.code,
+            market_code,
             window_start,
             reference_date,
-            fetched_days,
-            inserted_rows,
-            skipped_days,
+            market_stats["fetched_days"],
+            market_stats["inserted_rows"],
+            market_stats["skipped_days"],
         )
 
 
-def find_history_anchor_date(
+# Latest stored date of one anchor window. MAX() over a range of the
+# (market_code, as_of_date) index resolves with a single B-tree descent.
+_ANCHOR_WINDOW_MAX_SQL = """
+    (SELECT MAX(as_of_date)
+     FROM history_prices
+     WHERE market_code = ?
+       AND as_of_date < ?
+       AND as_of_date <= ?
+       AND as_of_date >= ?)
+"""
+
+
+def find_history_anchor_dates(
     conn: sqlite3.Connection,
     market_code: str,
     as_of_date: str,
-    timeframe_key: str,
     backtrack_days: int,
-) -> Optional[str]:
-    lookback_days = TIMEFRAME_LOOKBACK_DAYS.get(timeframe_key)
-    if lookback_days is None:
-        return None
+) -> dict[str, Optional[str]]:
+    """Resolve the stored anchor date of every lookback timeframe at once.
 
-    target_date = iso_days_ago(as_of_date, lookback_days)
-    lower_bound = iso_days_ago(target_date, max(backtrack_days, 0))
+    One statement per market carries a scalar subquery per timeframe, so the
+    anchors cost a single round trip instead of one query each.
+    """
+    params: list[str] = []
+    for lookback_days in TIMEFRAME_LOOKBACK_DAYS.values():
+        target_date = iso_days_ago(as_of_date, lookback_days)
+        lower_bound = iso_days_ago(target_date, max(backtrack_days, 0))
+        params.extend((market_code, as_of_date, target_date, lower_bound))
 
     row = conn.execute(
-        """
-        SELECT MAX(as_of_date)
-        FROM history_prices
-        WHERE market_code = ?
-          AND as_of_date < ?
-          AND as_of_date <= ?
-          AND as_of_date >= ?
-        """,
-        (market_code, as_of_date, target_date, lower_bound),
+        "SELECT " + ", ".join([_ANCHOR_WINDOW_MAX_SQL] * len(TIMEFRAME_LOOKBACK_DAYS)),
+        params,
     ).fetchone()
 
-    if row is None or row[0] is None:
-        return None
-    return str(row[0])
+    return {
+        timeframe_key: str(anchor) if anchor is not None else None
+        for timeframe_key, anchor in zip(TIMEFRAME_LOOKBACK_DAYS, row)
+    }
+
+
+# One missing anchor to resolve: ``(timeframe_key, [(candidate_date,
+# is_stored), ...])`` with candidates ordered nearest-first.
+AnchorPlan = tuple[str, list[tuple[str, bool]]]
+# Result of probing one AnchorPlan: ``(timeframe_key, anchor_date, rows)``.
+AnchorProbeOutcome = tuple[str, Optional[str], Optional[list[DailyPriceRow]]]
+
+
+def probe_history_anchor_candidates(
+    api_key: str,
+    market: MarketDefinition,
+    anchor_plans: list[AnchorPlan],
+    timeout_seconds: int,
+    max_retries: int,
+    logger: logging.Logger,
+) -> list[AnchorProbeOutcome]:
+    """Walk the candidate dates of each missing anchor of one market.
+
+    Runs on a worker thread and never touches SQLite: each candidate already
+    carries whether its date is stored. Returns one ``(timeframe_key,
+    anchor_date, rows)`` per plan, where ``rows`` is ``None`` for a stored
+    date and ``anchor_date`` is ``None`` when no candidate resolved.
+    """
+    # Dates fetched for an earlier timeframe count as stored for later ones.
+    fetched_dates: set[str] = set()
+    outcomes: list[AnchorProbeOutcome] = []
+    for timeframe_key, candidates in anchor_plans:
+        outcome: AnchorProbeOutcome = (timeframe_key, None, None)
+        for candidate_date, is_stored in candidates:
+            if is_stored or candidate_date in fetched_dates:
+                outcome = (timeframe_key, candidate_date, None)
+                break
+
+            try:
+                bootstrap_rows = fetch_market_rows(
+                    market=market,
+                    api_key=api_key,
+                    fallback_date=candidate_date,
+                    timeout_seconds=timeout_seconds,
+                    max_retries=max_retries,
+                    logger=logger,
+                    trading_date=candidate_date,
+                )
+            except PaymentRequiredError:
+                logger.error(
+                    "API credits exhausted during bootstrap [%s %s %s]. "
+                    "Aborting anchor search.",
+                    market.code,
+                    timeframe_key,
+                    candidate_date,
+                )
+                break
+            except Exception as exc:
+                safe_detail = sanitize_sensitive_text(str(exc), [api_key])
+                logger.warning(
+                    "History bootstrap fetch failed [%s %s %s]: %s",
+                    market.code,
+                    timeframe_key,
+                    candidate_date,
+                    safe_detail,
+                )
+                continue
+
+            if bootstrap_rows:
+                fetched_dates.add(candidate_date)
+            outcome = (timeframe_key, candidate_date, bootstrap_rows)
+            break
+        outcomes.append(outcome)
+    return outcomes
 
 
 def bootstrap_missing_history_anchors(
@@ -1058,21 +1519,27 @@ def bootstrap_missing_history_anchors(
     backtrack_days: int,
     logger: logging.Logger,
 ) -> None:
+    # Plan every market's missing anchors against the DB first, then probe
+    # the markets concurrently. Within a market the timeframes and candidate
+    # dates keep their sequential order, so no speculative (credit-consuming)
+    # calls are made; rows are written to SQLite on this thread.
+    pending: list[tuple[MarketDefinition, list[AnchorPlan]]] = []
     for market in markets:
         market_rows = rows_by_market.get(market.code, [])
         if not market_rows:
             continue
 
-        as_of_date = Counter(row.as_of_date for row in market_rows).most_common(1)[0][0]
+        as_of_date = most_common_as_of_date(market_rows)
+        anchor_dates = find_history_anchor_dates(
+            conn=conn,
+            market_code=market.code,
+            as_of_date=as_of_date,
+            backtrack_days=backtrack_days,
+        )
 
+        anchor_plans: list[AnchorPlan] = []
         for timeframe_key, lookback_days in TIMEFRAME_LOOKBACK_DAYS.items():
-            anchor_date = find_history_anchor_date(
-                conn=conn,
-                market_code=market.code,
-                as_of_date=as_of_date,
-                timeframe_key=timeframe_key,
-                backtrack_days=backtrack_days,
-            )
+            anchor_date = anchor_dates[timeframe_key]
             if anchor_date:
                 logger.info(
                     "History anchor available [%s %s] at %s",
@@ -1090,72 +1557,68 @@ def bootstrap_missing_history_anchors(
                 target_date,
             )
 
-            anchor_found = False
+            # Parsed once; each backtrack step is then plain date arithmetic.
+            # Candidates after the first stored date are never reached.
+            target_day = date.fromisoformat(target_date)
+            candidates: list[tuple[str, bool]] = []
             for offset in range(max(backtrack_days, 0) + 1):
-                candidate_date = iso_days_ago(target_date, offset)
+                candidate_date = (target_day - timedelta(days=offset)).isoformat()
                 if candidate_date >= as_of_date:
                     continue
+                is_stored = has_history_market_date(conn, market.code, candidate_date)
+                candidates.append((candidate_date, is_stored))
+                if is_stored:
+                    break
+            anchor_plans.append((timeframe_key, candidates))
+
+        if anchor_plans:
+            pending.append((market, anchor_plans))
+
+    if not pending:
+        return
 
-                if has_history_market_date(conn, market.code, candidate_date):
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_MARKET_FETCH_WORKERS, len(pending))
+    ) as executor:
+        futures = {
+            executor.submit(
+                probe_history_anchor_candidates,
+                api_key=api_key,
+                market=market,
+                anchor_plans=anchor_plans,
+                timeout_seconds=timeout_seconds,
+                max_retries=max_retries,
+                logger=logger,
+            ): market
+            for market, anchor_plans in pending
+        }
+        for future in as_completed(futures):
+            market = futures[future]
+            for timeframe_key, anchor_date, bootstrap_rows in future.result():
+                if anchor_date is None:
+                    logger.warning(
+                        "Unable to bootstrap history anchor for %s [%s] after %d days backtrack.",
+                        market.code,
+                        timeframe_key,
+                        backtrack_days,
+                    )
+                elif bootstrap_rows is None:
                     logger.info(
                         "History anchor resolved by existing market date [%s] %s",
                         market.code,
-                        candidate_date,
-                    )
-                    anchor_found = True
-                    break
-
-                try:
-                    raw_data = fetch_bulk_last_day(
-                        api_key=api_key,
-                        market_code=market.code,
-                        timeout_seconds=timeout_seconds,
-                        max_retries=max_retries,
-                        logger=logger,
-                        trading_date=candidate_date,
-                    )
-                    bootstrap_rows = build_price_rows(
-                        market=market,
-                        raw_rows=raw_data,
-                        fallback_date=candidate_date,
-                        logger=logger,
+                        anchor_date,
                     )
+                else:
                     upsert_history_rows(conn, bootstrap_rows)
-                    conn.commit()
                     logger.info(
                         "History bootstrap stored %d rows for %s on %s",
                         len(bootstrap_rows),
                         market.code,
-                        candidate_date,
-                    )
-                    anchor_found = True
-                    break
-                except PaymentRequiredError:
-                    logger.error(
-                        "API credits exhausted during bootstrap [%s %s %s]. "
-                        "Aborting anchor search.",
-                        market.code,
-                        timeframe_key,
-                        candidate_date,
-                    )
-                    break
-                except Exception as exc:
-                    safe_detail = sanitize_sensitive_text(str(exc), [api_key])
-                    logger.warning(
-                        "History bootstrap fetch failed [%s %s %s]: %s",
-                        market.code,
-                        timeframe_key,
-                        candidate_date,
-                        safe_detail,
+                        anchor_date,
                     )
 
-            if not anchor_found:
-                logger.warning(
-                    "Unable to bootstrap history anchor for %s [%s] after %d days backtrack.",
-                    market.code,
-                    timeframe_key,
-                    backtrack_days,
-                )
+    # Stored anchors are committed by the caller, together with the rest of
+    # the history update.
 
 
 def prune_history_rows(
@@ -1183,39 +1646,53 @@ def prune_history_rows(
     )
 
 
-def load_reference_prices_for_timeframe(
+# Per-ticker reference close of one timeframe: each ticker's latest stored
+# day inside the timeframe's anchor window. The leading column tags the rows
+# so several timeframes can share one statement.
+#
+# The window is read as a range of the (market_code, as_of_date) index, so
+# only the window's rows are visited; left to itself the planner walks the
+# primary key over the market's whole history to avoid sorting for GROUP BY.
+# With a single MAX() aggregate SQLite takes the bare ``close`` column from
+# the row holding the maximum, so no join back to the table is needed.
+_TIMEFRAME_REFERENCE_SQL = """
+    SELECT ? AS timeframe_key, ticker, close, MAX(as_of_date) AS reference_date
+    FROM history_prices INDEXED BY idx_history_prices_market_date
+    WHERE market_code = ?
+      AND as_of_date < ?
+      AND as_of_date <= ?
+      AND as_of_date >= ?
+    GROUP BY ticker
+"""
+
+
+def load_reference_prices_by_timeframe(
     conn: sqlite3.Connection,
     market_code: str,
     as_of_date: str,
-    timeframe_key: str,
     backtrack_days: int,
-) -> dict[str, tuple[float, str]]:
-    lookback_days = TIMEFRAME_LOOKBACK_DAYS[timeframe_key]
-    target_date = iso_days_ago(as_of_date, lookback_days)
-    lower_bound = iso_days_ago(target_date, max(backtrack_days, 0))
+) -> dict[str, dict[str, tuple[float, str]]]:
+    """Load ``{timeframe: {ticker: (close, date)}}`` for every lookback timeframe.
 
+    The per-timeframe lookups are combined with UNION ALL, so a market costs
+    one statement instead of one per timeframe.
+    """
+    params: list[str] = []
+    for timeframe_key, lookback_days in TIMEFRAME_LOOKBACK_DAYS.items():
+        target_date = iso_days_ago(as_of_date, lookback_days)
+        lower_bound = iso_days_ago(target_date, max(backtrack_days, 0))
+        params.extend((timeframe_key, market_code, as_of_date, target_date, lower_bound))
+
+    references: dict[str, dict[str, tuple[float, str]]] = {
+        timeframe_key: {} for timeframe_key in TIMEFRAME_LOOKBACK_DAYS
+    }
     cursor = conn.execute(
-        """
-        WITH latest_reference AS (
-            SELECT ticker, MAX(as_of_date) AS reference_date
-            FROM history_prices
-            WHERE market_code = ?
-              AND as_of_date < ?
-              AND as_of_date <= ?
-              AND as_of_date >= ?
-            GROUP BY ticker
-        )
-        SELECT h.ticker, h.close, h.as_of_date
-        FROM history_prices h
-        INNER JOIN latest_reference lr
-            ON lr.ticker = h.ticker
-           AND lr.reference_date = h.as_of_date
-        WHERE h.market_code = ?
-        """,
-        (market_code, as_of_date, target_date, lower_bound, market_code),
+        " UNION ALL ".join([_TIMEFRAME_REFERENCE_SQL] * len(TIMEFRAME_LOOKBACK_DAYS)),
+        params,
     )
-
-    return {str(row[0]): (float(row[1]), str(row[2])) for row in cursor}
+    for timeframe_key, ticker, close, reference_date in cursor:
+        references[timeframe_key][str(ticker)] = (float(close), str(reference_date))
+    return references
 
 
 def safe_percent_change(current: float, reference: float) -> Optional[float]:
@@ -1251,6 +1728,37 @@ def load_history_depth_by_ticker(
 
 
 
+def load_market_history_inputs(
+    history_db_path: Path,
+    market_code: str,
+    as_of_date: str,
+    backtrack_days: int,
+    load_depth: bool,
+) -> tuple[dict[str, int], dict[str, dict[str, tuple[float, str]]]]:
+    """Load one market's history depth and timeframe reference prices.
+
+    Opens its own read-only connection, so several markets can be queried
+    concurrently while the previous ones are ranked in Python.
+    """
+    with closing(connect_history_reader(history_db_path)) as conn:
+        history_depth_by_ticker = (
+            load_history_depth_by_ticker(
+                conn=conn,
+                market_code=market_code,
+                as_of_date=as_of_date,
+            )
+            if load_depth
+            else {}
+        )
+        references_by_timeframe = load_reference_prices_by_timeframe(
+            conn=conn,
+            market_code=market_code,
+            as_of_date=as_of_date,
+            backtrack_days=backtrack_days,
+        )
+    return history_depth_by_ticker, references_by_timeframe
+
+
 def row_to_mover_json(row: DailyPriceRow, change_percent: float) -> dict[str, Any]:
     return {
         "symbol": row.ticker,
@@ -1271,8 +1779,226 @@ def row_to_mover_json(row: DailyPriceRow, change_percent: float) -> dict[str, An
     }
 
 
+def cached_row_to_mover_json(
+    cache: dict[str, dict[str, Any]],
+    row: DailyPriceRow,
+    change_percent: float,
+) -> dict[str, Any]:
+    """Same output as :func:`row_to_mover_json`, reusing the row's fields.
+
+    A ticker often ranks in several timeframes; its rounded row fields are
+    built once per market (keyed by ticker, which is unique within a market)
+    and each entry only overrides the change, keeping the key order.
+    """
+    base = cache.get(row.ticker)
+    if base is None:
+        base = cache[row.ticker] = row_to_mover_json(row, change_percent)
+        return base.copy()
+    entry = base.copy()
+    rounded_change = round(change_percent, 6)
+    entry["change_percent"] = rounded_change
+    entry["changePercent"] = rounded_change
+    return entry
+
+
+def build_market_movers_payload(
+    market: MarketDefinition,
+    market_rows: list[DailyPriceRow],
+    as_of_date: str,
+    history_depth_by_ticker: dict[str, int],
+    references_by_timeframe: dict[str, dict[str, tuple[float, str]]],
+    top_limit: int,
+    min_dollar_volume: int,
+    min_price: float,
+    logger: logging.Logger,
+    investor_grade_filters: bool,
+    investor_min_price: float,
+    tf_min_dv: dict[str, int],
+    tf_max_change: dict[str, float],
+    tf_min_history: dict[str, int],
+    excluded_ticker_patterns: list[str],
+) -> dict[str, Any]:
+    """Rank one market's movers for every timeframe.
+
+    Pure Python over the day's rows and the history inputs already loaded by
+    :func:`load_market_history_inputs`; the filters are the resolved
+    per-timeframe settings of :func:`build_top_movers_payload`.
+    """
+    # Loop-invariant helpers, resolved once rather than per row / timeframe.
+    isfinite = math.isfinite
+    by_change = itemgetter(1)
+
+    ranked: dict[str, list[tuple[DailyPriceRow, float]]] = {
+        tf: [] for tf in TIMEFRAME_KEYS
+    }
+
+    # 1D from the current EODHD payload.
+    ranked_one_day = ranked["1D"]
+    for row in market_rows:
+        change_percent = row.change_percent
+        if change_percent is not None and isfinite(change_percent):
+            ranked_one_day.append((row, change_percent))
+
+    for timeframe_key, reference_by_ticker in references_by_timeframe.items():
+        if not reference_by_ticker:
+            logger.warning(
+                "No rolling-history references found [%s %s] as_of=%s",
+                market.code,
+                timeframe_key,
+                as_of_date,
+            )
+            continue
+
+        # Resolve the per-timeframe containers once, not once per row.
+        lookup_reference = reference_by_ticker.get
+        ranked_timeframe = ranked[timeframe_key]
+        for row in market_rows:
+            reference = lookup_reference(row.ticker)
+            if reference is None:
+                continue
+
+            reference_close, reference_date = reference
+            if reference_date >= row.as_of_date:
+                continue
+
+            pct = safe_percent_change(row.close, reference_close)
+            if pct is not None:
+                ranked_timeframe.append((row, pct))
+
+    mover_json_by_ticker: dict[str, dict[str, Any]] = {}
+    timeframes_payload: dict[str, Any] = {}
+    for tf in TIMEFRAME_KEYS:
+        pool = ranked[tf]
+
+        investor_min_dv = tf_min_dv.get(tf, min_dollar_volume)
+        investor_max_chg = tf_max_change.get(tf, math.inf)
+        investor_min_history = tf_min_history.get(tf, 0)
+
+        # One pass applies every filter stage in order, counting the
+        # survivors of each stage and splitting the final pool by sign,
+        # instead of materializing an intermediate list per stage.
+        price_filtered_count = 0
+        dollar_volume_filtered_count = 0
+        final_count = 0
+        skipped_price = 0
+        skipped_dollar_volume = 0
+        skipped_change_cap = 0
+        skipped_history = 0
+        skipped_pattern = 0
+        positive_pool: list[tuple[DailyPriceRow, float]] = []
+        negative_pool: list[tuple[DailyPriceRow, float]] = []
+
+        for entry in pool:
+            row_obj, change_pct = entry
+            # Always-on: legacy raw filters (penny + 1M USD volume).
+            if row_obj.close < min_price:
+                continue
+            price_filtered_count += 1
+            if row_obj.dollar_volume < min_dollar_volume:
+                continue
+            dollar_volume_filtered_count += 1
+
+            if investor_grade_filters:
+                if row_obj.close < investor_min_price:
+                    skipped_price += 1
+                    continue
+                if row_obj.dollar_volume < investor_min_dv:
+                    skipped_dollar_volume += 1
+                    continue
+                if abs(change_pct) > investor_max_chg:
+                    skipped_change_cap += 1
+                    continue
+                if (
+                    investor_min_history > 0
+                    and history_depth_by_ticker.get(row_obj.ticker, 0)
+                        < investor_min_history
+                ):
+                    skipped_history += 1
+                    continue
+                if is_excluded_ticker(row_obj.ticker):
+                    skipped_pattern += 1
+                    continue
+
+            final_count += 1
+            if change_pct > 0:
+                positive_pool.append(entry)
+            elif change_pct < 0:
+                negative_pool.append(entry)
+
+        if investor_grade_filters:
+            investor_diagnostics = {
+                "skipped_below_investor_price": skipped_price,
+                "skipped_below_investor_dollar_volume": skipped_dollar_volume,
+                "skipped_above_change_cap": skipped_change_cap,
+                "skipped_below_history_depth": skipped_history,
+                "skipped_excluded_pattern": skipped_pattern,
+            }
+        else:
+            investor_diagnostics = {}
+
+        # Partial selection: O(n log k) instead of sorting the pool.
+        gainers = nlargest(top_limit, positive_pool, key=by_change)
+        losers = nsmallest(top_limit, negative_pool, key=by_change)
+        timeframes_payload[tf] = {
+            "eligible_symbols": len(positive_pool) + len(negative_pool),
+            "eligible_before_filters": len(pool),
+            "eligible_after_price_filter": price_filtered_count,
+            "eligible_after_dollar_volume_filter": dollar_volume_filtered_count,
+            "eligible_after_investor_filters": final_count
+                if investor_grade_filters else None,
+            "filters": {
+                "min_price": (
+                    investor_min_price if investor_grade_filters else min_price
+                ),
+                "min_dollar_volume": (
+                    tf_min_dv.get(tf, min_dollar_volume)
+                    if investor_grade_filters
+                    else min_dollar_volume
+                ),
+                "max_abs_change_percent": (
+                    tf_max_change.get(tf) if investor_grade_filters else None
+                ),
+                "min_history_days": (
+                    tf_min_history.get(tf, 0) if investor_grade_filters else 0
+                ),
+                "excluded_ticker_patterns": excluded_ticker_patterns,
+            },
+            "investor_grade_diagnostics": investor_diagnostics,
+            "gainers": [
+                cached_row_to_mover_json(mover_json_by_ticker, r, c)
+                for r, c in gainers
+            ],
+            "losers": [
+                cached_row_to_mover_json(mover_json_by_ticker, r, c)
+                for r, c in losers
+            ],
+        }
+
+    logger.info(
+        "Top movers [%s] mode=%s | 1D=%d/%d 5D=%d/%d 1M=%d/%d 1Y=%d/%d eligible (final/raw)",
+        market.code,
+        "investor" if investor_grade_filters else "raw",
+        timeframes_payload["1D"]["eligible_symbols"],
+        timeframes_payload["1D"]["eligible_before_filters"],
+        timeframes_payload["5D"]["eligible_symbols"],
+        timeframes_payload["5D"]["eligible_before_filters"],
+        timeframes_payload["1M"]["eligible_symbols"],
+        timeframes_payload["1M"]["eligible_before_filters"],
+        timeframes_payload["1Y"]["eligible_symbols"],
+        timeframes_payload["1Y"]["eligible_before_filters"],
+    )
+
+    return {
+        "code": market.code,
+        "name": market.name,
+        "currency": market.default_currency,
+        "as_of_date": as_of_date,
+        "timeframes": timeframes_payload,
+    }
+
+
 def build_top_movers_payload(
-    rows: list[DailyPriceRow],
+    rows_by_market: dict[str, list[DailyPriceRow]],
     markets: list[MarketDefinition],
     top_limit: int,
     min_dollar_volume: int,
@@ -1280,6 +2006,7 @@ def build_top_movers_payload(
     history_db_path: Path,
     history_backtrack_days: int,
     logger: logging.Logger,
+    generated_at_utc: str,
     investor_grade_filters: bool = True,
     investor_min_price: float = 5.0,
     timeframe_min_dollar_volume: Optional[dict[str, int]] = None,
@@ -1288,6 +2015,11 @@ def build_top_movers_payload(
 ) -> dict[str, Any]:
     """Compute top movers for all markets using rolling history references.
 
+    ``rows_by_market`` is the day's rows grouped by market code, as already
+    built by the caller for the history steps. The committed history DB at
+    ``history_db_path`` is read through :func:`load_market_history_inputs`,
+    up to :data:`MAX_HISTORY_READ_WORKERS` markets at a time.
+
     When ``investor_grade_filters`` is enabled (default), each timeframe is
     additionally filtered to keep only securities a typical buy-and-hold
     investor would consider:
@@ -1304,10 +2036,6 @@ def build_top_movers_payload(
     * exclusion of warrant / right / unit / preferred share derivative
       tickers (see :data:`EXCLUDED_TICKER_PATTERNS`)
     """
-    rows_by_market: dict[str, list[DailyPriceRow]] = {}
-    for row in rows:
-        rows_by_market.setdefault(row.market_code, []).append(row)
-
     tf_min_dv = dict(DEFAULT_TIMEFRAME_MIN_DOLLAR_VOLUME)
     if timeframe_min_dollar_volume:
         tf_min_dv.update(timeframe_min_dollar_volume)
@@ -1320,195 +2048,60 @@ def build_top_movers_payload(
     if timeframe_min_history_days:
         tf_min_history.update(timeframe_min_history_days)
 
-    markets_payload: list[dict[str, Any]] = []
-
-    with sqlite3.connect(history_db_path) as conn:
-        ensure_history_schema(conn)
-
-        for market in markets:
-            market_rows = rows_by_market.get(market.code, [])
-            if not market_rows:
-                continue
-
-            as_of_date = Counter(
-                row.as_of_date for row in market_rows
-            ).most_common(1)[0][0]
-
-            history_depth_by_ticker: dict[str, int] = {}
-            if investor_grade_filters and any(
-                tf_min_history.get(tf, 0) > 0 for tf in TIMEFRAME_KEYS
-            ):
-                history_depth_by_ticker = load_history_depth_by_ticker(
-                    conn=conn,
-                    market_code=market.code,
-                    as_of_date=as_of_date,
-                )
-
-            ranked: dict[str, list[tuple[DailyPriceRow, float]]] = {
-                tf: [] for tf in TIMEFRAME_KEYS
-            }
-
-            for row in market_rows:
-                # 1D from the current EODHD payload.
-                if row.change_percent is not None and math.isfinite(row.change_percent):
-                    ranked["1D"].append((row, row.change_percent))
-
-            for timeframe_key in TIMEFRAME_LOOKBACK_DAYS:
-                reference_by_ticker = load_reference_prices_for_timeframe(
-                    conn=conn,
-                    market_code=market.code,
-                    as_of_date=as_of_date,
-                    timeframe_key=timeframe_key,
-                    backtrack_days=history_backtrack_days,
-                )
-
-                if not reference_by_ticker:
-                    logger.warning(
-                        "No rolling-history references found [%s %s] as_of=%s",
-                        market.code,
-                        timeframe_key,
-                        as_of_date,
-                    )
+    excluded_ticker_patterns = (
+        [p.pattern for p in EXCLUDED_TICKER_PATTERNS] if investor_grade_filters else []
+    )
 
-                for row in market_rows:
-                    reference = reference_by_ticker.get(row.ticker)
-                    if reference is None:
-                        continue
-
-                    reference_close, reference_date = reference
-                    if reference_date >= row.as_of_date:
-                        continue
-
-                    pct = safe_percent_change(row.close, reference_close)
-                    if pct is not None:
-                        ranked[timeframe_key].append((row, pct))
-
-            timeframes_payload: dict[str, Any] = {}
-            for tf in TIMEFRAME_KEYS:
-                pool = ranked[tf]
-
-                # Always-on: legacy raw filters (penny + 1M USD volume).
-                price_filtered_pool = [
-                    item for item in pool if item[0].close >= min_price
-                ]
-                dollar_volume_filtered_pool = [
-                    item
-                    for item in price_filtered_pool
-                    if item[0].dollar_volume >= min_dollar_volume
-                ]
-
-                if investor_grade_filters:
-                    investor_min_dv = tf_min_dv.get(tf, min_dollar_volume)
-                    investor_max_chg = tf_max_change.get(tf, math.inf)
-                    investor_min_history = tf_min_history.get(tf, 0)
-
-                    investor_pool: list[tuple[DailyPriceRow, float]] = []
-                    skipped_price = 0
-                    skipped_dollar_volume = 0
-                    skipped_change_cap = 0
-                    skipped_history = 0
-                    skipped_pattern = 0
-
-                    for entry in dollar_volume_filtered_pool:
-                        row_obj, change_pct = entry
-                        if row_obj.close < investor_min_price:
-                            skipped_price += 1
-                            continue
-                        if row_obj.dollar_volume < investor_min_dv:
-                            skipped_dollar_volume += 1
-                            continue
-                        if abs(change_pct) > investor_max_chg:
-                            skipped_change_cap += 1
-                            continue
-                        if (
-                            investor_min_history > 0
-                            and history_depth_by_ticker.get(row_obj.ticker, 0)
-                                < investor_min_history
-                        ):
-                            skipped_history += 1
-                            continue
-                        if is_excluded_ticker(row_obj.ticker):
-                            skipped_pattern += 1
-                            continue
-                        investor_pool.append(entry)
-
-                    final_pool = investor_pool
-                    investor_diagnostics = {
-                        "skipped_below_investor_price": skipped_price,
-                        "skipped_below_investor_dollar_volume": skipped_dollar_volume,
-                        "skipped_above_change_cap": skipped_change_cap,
-                        "skipped_below_history_depth": skipped_history,
-                        "skipped_excluded_pattern": skipped_pattern,
-                    }
-                else:
-                    final_pool = dollar_volume_filtered_pool
-                    investor_diagnostics = {}
-
-                positive_pool = [item for item in final_pool if item[1] > 0]
-                negative_pool = [item for item in final_pool if item[1] < 0]
-                gainers = sorted(positive_pool, key=lambda x: x[1], reverse=True)[:top_limit]
-                losers = sorted(negative_pool, key=lambda x: x[1])[:top_limit]
-                timeframes_payload[tf] = {
-                    "eligible_symbols": len(positive_pool) + len(negative_pool),
-                    "eligible_before_filters": len(pool),
-                    "eligible_after_price_filter": len(price_filtered_pool),
-                    "eligible_after_dollar_volume_filter": len(
-                        dollar_volume_filtered_pool
-                    ),
-                    "eligible_after_investor_filters": len(final_pool)
-                        if investor_grade_filters else None,
-                    "filters": {
-                        "min_price": (
-                            investor_min_price if investor_grade_filters else min_price
-                        ),
-                        "min_dollar_volume": (
-                            tf_min_dv.get(tf, min_dollar_volume)
-                            if investor_grade_filters
-                            else min_dollar_volume
-                        ),
-                        "max_abs_change_percent": (
-                            tf_max_change.get(tf) if investor_grade_filters else None
-                        ),
-                        "min_history_days": (
-                            tf_min_history.get(tf, 0) if investor_grade_filters else 0
-                        ),
-                        "excluded_ticker_patterns": (
-                            [p.pattern for p in EXCLUDED_TICKER_PATTERNS]
-                            if investor_grade_filters
-                            else []
-                        ),
-                    },
-                    "investor_grade_diagnostics": investor_diagnostics,
-                    "gainers": [row_to_mover_json(r, c) for r, c in gainers],
-                    "losers": [row_to_mover_json(r, c) for r, c in losers],
-                }
+    # Keyed by market code (codes are unique after resolve_markets); insertion
+    # order keeps the output list in requested-market order.
+    markets_by_code: dict[str, dict[str, Any]] = {}
 
-            logger.info(
-                "Top movers [%s] mode=%s | 1D=%d/%d 5D=%d/%d 1M=%d/%d 1Y=%d/%d eligible (final/raw)",
-                market.code,
-                "investor" if investor_grade_filters else "raw",
-                timeframes_payload["1D"]["eligible_symbols"],
-                timeframes_payload["1D"]["eligible_before_filters"],
-                timeframes_payload["5D"]["eligible_symbols"],
-                timeframes_payload["5D"]["eligible_before_filters"],
-                timeframes_payload["1M"]["eligible_symbols"],
-                timeframes_payload["1M"]["eligible_before_filters"],
-                timeframes_payload["1Y"]["eligible_symbols"],
-                timeframes_payload["1Y"]["eligible_before_filters"],
+    load_depth = investor_grade_filters and any(
+        tf_min_history.get(tf, 0) > 0 for tf in TIMEFRAME_KEYS
+    )
+    active_markets = [market for market in markets if rows_by_market.get(market.code)]
+
+    # SQLite releases the GIL, so the history reads of later markets run on
+    # worker threads while earlier markets are ranked here, in market order.
+    with ThreadPoolExecutor(
+        max_workers=max(min(MAX_HISTORY_READ_WORKERS, len(active_markets)), 1)
+    ) as executor:
+        pending_inputs = []
+        for market in active_markets:
+            as_of_date = most_common_as_of_date(rows_by_market[market.code])
+            history_inputs = executor.submit(
+                load_market_history_inputs,
+                history_db_path=history_db_path,
+                market_code=market.code,
+                as_of_date=as_of_date,
+                backtrack_days=history_backtrack_days,
+                load_depth=load_depth,
             )
+            pending_inputs.append((market, as_of_date, history_inputs))
 
-            markets_payload.append(
-                {
-                    "code": market.code,
-                    "name": market.name,
-                    "currency": market.default_currency,
-                    "as_of_date": as_of_date,
-                    "timeframes": timeframes_payload,
-                }
+        for market, as_of_date, history_inputs in pending_inputs:
+            history_depth_by_ticker, references_by_timeframe = history_inputs.result()
+
+            markets_by_code[market.code] = build_market_movers_payload(
+                market=market,
+                market_rows=rows_by_market[market.code],
+                as_of_date=as_of_date,
+                history_depth_by_ticker=history_depth_by_ticker,
+                references_by_timeframe=references_by_timeframe,
+                top_limit=top_limit,
+                min_dollar_volume=min_dollar_volume,
+                min_price=min_price,
+                logger=logger,
+                investor_grade_filters=investor_grade_filters,
+                investor_min_price=investor_min_price,
+                tf_min_dv=tf_min_dv,
+                tf_max_change=tf_max_change,
+                tf_min_history=tf_min_history,
+                excluded_ticker_patterns=excluded_ticker_patterns,
             )
 
     payload: dict[str, Any] = {
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at_utc,
         "source": "EODHD_BULK_LAST_DAY",
         "timeframes": list(TIMEFRAME_KEYS),
         "filters": {
@@ -1534,17 +2127,16 @@ def build_top_movers_payload(
                 if investor_grade_filters
                 else None
             ),
-            "excluded_ticker_patterns": (
-                [p.pattern for p in EXCLUDED_TICKER_PATTERNS]
-                if investor_grade_filters
-                else []
-            ),
+            "excluded_ticker_patterns": excluded_ticker_patterns,
+        },
+        "markets": list(markets_by_code.values()),
+        "counts": {
+            "input_rows": sum(map(len, rows_by_market.values())),
+            "markets": len(markets_by_code),
         },
-        "markets": markets_payload,
-        "counts": {"input_rows": len(rows), "markets": len(markets_payload)},
     }
 
-    us_payload = next((m for m in markets_payload if m["code"] == "US"), None)
+    us_payload = markets_by_code.get("US")
     if us_payload:
         payload["market"] = "US"
         payload["as_of_date"] = us_payload["as_of_date"]
@@ -1555,54 +2147,73 @@ def build_top_movers_payload(
 
 
 def build_prices_index_payload(
-    rows: list[DailyPriceRow],
+    rows_by_market: dict[str, list[DailyPriceRow]],
     markets: list[MarketDefinition],
+    generated_at_utc: str,
 ) -> dict[str, Any]:
     """Build a flat ticker→price lookup map for client-side portfolio quote lookup.
 
     Each entry is stored twice:
-    - ``TICKER``          – flat key (US has priority; last market wins for others)
+    - ``TICKER``          – flat key (the first configured market wins, so US
+      has priority when listed first)
     - ``MARKET:TICKER``   – unambiguous key, always accurate
 
     Clients should prefer the market-prefixed key when the exchange is known.
     """
-    market_priority: dict[str, int] = {m.code: i for i, m in enumerate(markets)}
-
-    flat: dict[str, dict[str, Any]] = {}
-    best_priority: dict[str, int] = {}
-
     prices: dict[str, dict[str, Any]] = {}
 
-    for row in rows:
-        entry = {
-            "c": round(row.close, 6),
-            "cu": row.currency,
-            "m": row.market_code,
-            "d": row.as_of_date,
-        }
-
-        mkt_key = f"{row.market_code}:{row.ticker}"
-        prices[mkt_key] = entry
-
-        priority = market_priority.get(row.market_code, 9999)
-        current_best = best_priority.get(row.ticker, 9999)
-        if priority < current_best:
-            flat[row.ticker] = entry
-            best_priority[row.ticker] = priority
-
-    prices.update(flat)
+    # Walking the markets in priority order means the first entry seen for a
+    # ticker is the one its flat key keeps, so both keys go straight into
+    # ``prices``; no per-ticker priority or separate flat map is tracked.
+    # Prefixed keys always contain ":" and EODHD ticker codes do not, so the
+    # two key spaces cannot collide.
+    keep_flat = prices.setdefault
+    for market in markets:
+        # Rows are grouped by market, so the "MARKET:" prefix is built once and
+        # each key is a single concatenation instead of an f-string format.
+        market_prefix = market.code + ":"
+        for row in rows_by_market.get(market.code, ()):
+            entry = {
+                "c": round(row.close, 6),
+                "cu": row.currency,
+                "m": row.market_code,
+                "d": row.as_of_date,
+            }
+            prices[market_prefix + row.ticker] = entry
+            keep_flat(row.ticker, entry)
 
     return {
         "v": 1,
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_at_utc": generated_at_utc,
         "source": "EODHD_BULK_LAST_DAY",
         "prices": prices,
     }
 
 
-def write_json(path: Path, payload: dict[str, Any], logger: logging.Logger) -> None:
+def write_json(
+    path: Path,
+    payload: dict[str, Any],
+    logger: logging.Logger,
+    compact: bool = False,
+) -> None:
+    """Serialize ``payload`` to ``path`` as UTF-8 JSON.
+
+    ``compact`` drops indentation and separator whitespace; use it for large
+    machine-read files such as the prices index.
+
+    Serialized with orjson, which is pinned in scripts/eodhd/requirements.txt
+    so the float formatting of the committed top_movers.json stays stable.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    # NON_STR_KEYS mirrors stdlib json's coercion of int/float/bool keys.
+    options = orjson.OPT_NON_STR_KEYS
+    if not compact:
+        options |= orjson.OPT_INDENT_2
+    # Written to a sibling temp file, then atomically renamed, so a failed run
+    # never leaves a truncated JSON for publishing.
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_bytes(orjson.dumps(payload, option=options))
+    os.replace(temp_path, path)
     logger.info("JSON file generated: %s", path)
 
 
@@ -1650,67 +2261,92 @@ def main() -> int:
     )
 
     try:
-        today_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        # One clock read per run: every artifact carries the same timestamp.
+        run_started_at = datetime.now(timezone.utc)
+        generated_at_utc = run_started_at.isoformat()
+        today_utc = run_started_at.date().isoformat()
 
-        # --- 1. Fetch today's bulk prices for all markets ---
-        rows: list[DailyPriceRow] = []
-        failed_markets: list[str] = []
-        for market in markets:
-            try:
-                raw_data = fetch_bulk_last_day(
+        # --- 1. Prepare paths ---
+        db_path = output_dir / "daily_market.db"
+        db_zip_path = output_dir / "daily_market.db.zip"
+        history_db_path = output_dir / args.history_db_name
+        history_zip_path = output_dir / args.history_db_zip_name
+        top_movers_path = output_dir / "top_movers.json"
+        prices_index_path = output_dir / "prices_index.json"
+
+        # --- 2. Fetch today's bulk prices for all markets ---
+        # Downloads are independent and I/O-bound, so they run concurrently,
+        # together with the rolling-history DB download used from step 3 on.
+        # Rows are reassembled below in the configured market order.
+        fetched_rows_by_market: dict[str, list[DailyPriceRow]] = {}
+        fetch_workers = min(MAX_MARKET_FETCH_WORKERS, len(markets)) + 1
+        with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+            history_download = executor.submit(
+                fetch_history_db,
+                db_path=history_db_path,
+                history_url=args.history_db_url,
+                timeout_seconds=args.timeout_seconds,
+                logger=logger,
+            )
+            download_futures = {
+                executor.submit(
+                    fetch_market_rows,
+                    market=market,
                     api_key=api_key,
-                    market_code=market.code,
+                    fallback_date=today_utc,
                     timeout_seconds=args.timeout_seconds,
                     max_retries=args.max_retries,
                     logger=logger,
-                )
-                market_rows = build_price_rows(
-                    market=market,
-                    raw_rows=raw_data,
-                    fallback_date=today_utc,
-                    logger=logger,
-                )
-                rows.extend(market_rows)
-            except Exception as market_error:
+                ): market
+                for market in markets
+            }
+            for future in as_completed(download_futures):
+                market = download_futures[future]
+                try:
+                    fetched_rows_by_market[market.code] = future.result()
+                except Exception as market_error:
+                    logger.error(
+                        "Market %s skipped: %s",
+                        market.code,
+                        sanitize_sensitive_text(str(market_error), [api_key]),
+                    )
+
+        # rows_by_market is keyed in configured market order and drives every
+        # later per-market step; rows is the same data, flattened.
+        rows: list[DailyPriceRow] = []
+        rows_by_market: dict[str, list[DailyPriceRow]] = {}
+        failed_markets: list[str] = []
+        for market in markets:
+            market_rows = fetched_rows_by_market.get(market.code)
+            if market_rows is None:
                 failed_markets.append(market.code)
-                logger.error(
-                    "Market %s skipped: %s",
-                    market.code,
-                    sanitize_sensitive_text(str(market_error), [api_key]),
-                )
+            elif market_rows:
+                rows.extend(market_rows)
+                rows_by_market[market.code] = market_rows
 
         if not rows:
             raise RuntimeError("No market rows were generated from configured markets.")
         if failed_markets:
             logger.warning("Markets skipped: %s", ", ".join(failed_markets))
 
-        rows_by_market: dict[str, list[DailyPriceRow]] = {}
-        for row in rows:
-            rows_by_market.setdefault(row.market_code, []).append(row)
-
         latest_reference_date = max(row.as_of_date for row in rows)
 
-        # --- 2. Prepare paths ---
-        db_path = output_dir / "daily_market.db"
-        db_zip_path = output_dir / "daily_market.db.zip"
-        history_db_path = output_dir / args.history_db_name
-        history_zip_path = output_dir / args.history_db_zip_name
-        top_movers_path = output_dir / "top_movers.json"
-        prices_index_path = output_dir / "prices_index.json"
-
-        # --- 3. Download existing rolling-history DB from GitHub Pages (if configured) ---
-        fetch_history_db(
-            db_path=history_db_path,
-            history_url=args.history_db_url,
-            timeout_seconds=args.timeout_seconds,
-            logger=logger,
+        # Built once: feeds both the history upsert (step 4) and the daily
+        # snapshot archive (step 6).
+        snapshot_image = serialize_snapshot_db(
+            rows=rows, markets=markets, generated_at_utc=generated_at_utc
         )
 
+        # --- 3. Rolling-history DB from GitHub Pages (downloaded during step 2) ---
+        history_download.result()
+
         # --- 4. Upsert latest market day and bootstrap missing anchors ---
-        with sqlite3.connect(history_db_path) as conn:
+        with closing(connect_history_db(history_db_path)) as conn:
             ensure_history_schema(conn)
-            upsert_history_rows(conn, rows)
-            conn.commit()
+            # All history writes below form one transaction, committed once
+            # after the meta update; a failing run leaves the file untouched.
+            conn.execute("BEGIN IMMEDIATE")
+            upsert_history_from_snapshot(conn, snapshot_image)
 
             backfill_history_window(
                 api_key=api_key,
@@ -1742,31 +2378,23 @@ def main() -> int:
                 logger=logger,
             )
 
-            conn.execute(
-                "INSERT OR REPLACE INTO history_meta(key, value) VALUES (?, ?)",
-                ("last_run_utc", datetime.now(timezone.utc).isoformat()),
-            )
-            conn.execute(
-                "INSERT OR REPLACE INTO history_meta(key, value) VALUES (?, ?)",
-                ("last_reference_date", latest_reference_date),
-            )
-            conn.execute(
-                "INSERT OR REPLACE INTO history_meta(key, value) VALUES (?, ?)",
-                ("history_backfill_days", str(args.history_backfill_days)),
-            )
-            conn.execute(
-                "INSERT OR REPLACE INTO history_meta(key, value) VALUES (?, ?)",
-                ("mover_min_dollar_volume", str(args.min_dollar_volume)),
-            )
-            conn.execute(
+            conn.executemany(
                 "INSERT OR REPLACE INTO history_meta(key, value) VALUES (?, ?)",
-                ("mover_min_price", str(args.min_price)),
+                (
+                    ("last_run_utc", generated_at_utc),
+                    ("last_reference_date", latest_reference_date),
+                    ("history_backfill_days", str(args.history_backfill_days)),
+                    ("mover_min_dollar_volume", str(args.min_dollar_volume)),
+                    ("mover_min_price", str(args.min_price)),
+                ),
             )
             conn.commit()
 
         # --- 5. Compute top movers using rolling-history reference prices ---
+        # Read back from the committed history DB through read-only
+        # connections, one market per worker.
         payload = build_top_movers_payload(
-            rows=rows,
+            rows_by_market=rows_by_market,
             markets=markets,
             top_limit=args.top_limit,
             min_dollar_volume=args.min_dollar_volume,
@@ -1774,35 +2402,65 @@ def main() -> int:
             history_db_path=history_db_path,
             history_backtrack_days=args.history_bootstrap_backtrack_days,
             logger=logger,
+            generated_at_utc=generated_at_utc,
             investor_grade_filters=args.investor_grade_filters,
             investor_min_price=args.investor_min_price,
         )
-        write_json(top_movers_path, payload, logger)
 
-        # --- 6. Write today's daily snapshot DB (for reference / debugging) ---
-        write_sqlite_snapshot(db_path=db_path, rows=rows, markets=markets, logger=logger)
-        compress_file(source_path=db_path, zip_path=db_zip_path, logger=logger)
+        # Steps 6-8 are independent once the history DB is closed. SQLite and
+        # zlib release the GIL, so both archives are built on worker threads
+        # (the history archive is the longest step of the run) while the JSON
+        # outputs are serialized here.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # --- 6. Write today's daily snapshot DB (for reference / debugging) ---
+            snapshot_archive = executor.submit(
+                write_snapshot_archive,
+                db_path=db_path,
+                zip_path=db_zip_path,
+                snapshot_image=snapshot_image,
+                logger=logger,
+                keep_uncompressed_db=args.keep_uncompressed_db,
+            )
+
+            # --- 7. Compress updated history DB for GitHub Pages upload ---
+            history_archive = executor.submit(
+                compress_file,
+                source_path=history_db_path,
+                zip_path=history_zip_path,
+                logger=logger,
+                compresslevel=args.zip_compresslevel,
+            )
 
-        # --- 7. Compress updated history DB for GitHub Pages upload ---
-        compress_file(source_path=history_db_path, zip_path=history_zip_path, logger=logger)
+            write_json(top_movers_path, payload, logger)
 
-        # --- 8. Write prices_index.json ---
-        prices_index_payload = build_prices_index_payload(rows=rows, markets=markets)
-        write_json(prices_index_path, prices_index_payload, logger)
+            # --- 8. Write prices_index.json ---
+            prices_index_payload = build_prices_index_payload(
+                rows_by_market=rows_by_market, markets=markets, generated_at_utc=generated_at_utc
+            )
+            # Machine-read lookup map with tens of thousands of entries: emitted
+            # without indentation, which is a large share of its size.
+            write_json(prices_index_path, prices_index_payload, logger, compact=True)
+
+            snapshot_archive.result()
+            history_archive.result()
 
         # --- 9. Cleanup uncompressed files ---
         if not args.keep_uncompressed_db:
+            # One unlink per file, no exists() probe; the daily DB is normally
+            # never written to disk in this mode.
             for p in (db_path, history_db_path):
-                if p.exists():
-                    try:
-                        p.unlink()
-                        logger.info("Removed uncompressed file: %s", p)
-                    except OSError as exc:
-                        logger.warning(
-                            "Could not remove uncompressed file %s (continuing): %s",
-                            p,
-                            exc,
-                        )
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    continue
+                except OSError as exc:
+                    logger.warning(
+                        "Could not remove uncompressed file %s (continuing): %s",
+                        p,
+                        exc,
+                    )
+                    continue
+                logger.info("Removed uncompressed file: %s", p)
 
         logger.info("Workflow completed successfully.")
         return 0
@@ -0,0 +1,242 @@
+"""Unit tests for scripts/eodhd/build_daily_market_snapshot.py.
+
+Run from the repository root with
+``python -m unittest discover -s scripts/eodhd/tests``.
+"""
+
+from __future__ import annotations
+
+import email.message
+import io
+import logging
+import sqlite3
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+from urllib.error import HTTPError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import build_daily_market_snapshot as snapshot  # noqa: E402
+
+LOGGER = logging.getLogger("test_build_daily_market_snapshot")
+LOGGER.addHandler(logging.NullHandler())
+LOGGER.propagate = False
+
+
+class InsertRowsBatchedTest(unittest.TestCase):
+    COLUMNS = ("id", "label", "value")
+    # Three columns fill SQLITE_MAX_BOUND_PARAMETERS exactly at this many rows.
+    BATCH_ROWS = snapshot.SQLITE_MAX_BOUND_PARAMETERS // len(COLUMNS)
+
+    def setUp(self) -> None:
+        self.conn = sqlite3.connect(":memory:")
+        self.addCleanup(self.conn.close)
+        self.conn.execute("CREATE TABLE items (id INTEGER, label TEXT, value REAL)")
+        self.statements: list[str] = []
+        self.conn.set_trace_callback(self.statements.append)
+
+    def make_rows(self, count: int) -> list[tuple[int, str, float]]:
+        return [(index, f"row-{index}", index / 4) for index in range(count)]
+
+    def insert(self, rows: list[tuple[int, str, float]]) -> list[tuple]:
+        snapshot.insert_rows_batched(self.conn, "items", self.COLUMNS, rows)
+        self.conn.set_trace_callback(None)
+        return self.conn.execute("SELECT id, label, value FROM items ORDER BY rowid").fetchall()
+
+    def insert_statements(self) -> list[str]:
+        return [sql for sql in self.statements if sql.startswith("INSERT")]
+
+    def test_batch_fills_the_parameter_limit(self) -> None:
+        self.assertEqual(self.BATCH_ROWS * len(self.COLUMNS), snapshot.SQLITE_MAX_BOUND_PARAMETERS)
+
+    def test_no_rows_issues_no_statement(self) -> None:
+        self.assertEqual(self.insert([]), [])
+        self.assertEqual(self.insert_statements(), [])
+
+    def test_single_row_uses_the_single_row_statement(self) -> None:
+        rows = self.make_rows(1)
+        self.assertEqual(self.insert(rows), rows)
+        self.assertEqual(len(self.insert_statements()), 1)
+
+    def test_exactly_one_batch(self) -> None:
+        rows = self.make_rows(self.BATCH_ROWS)
+        self.assertEqual(self.insert(rows), rows)
+        self.assertEqual(len(self.insert_statements()), 1)
+
+    def test_one_row_past_the_batch_limit(self) -> None:
+        rows = self.make_rows(self.BATCH_ROWS + 1)
+        self.assertEqual(self.insert(rows), rows)
+        # One full batch, then the remainder through the single-row form.
+        self.assertEqual(len(self.insert_statements()), 2)
+
+
+def http_error(code: int, retry_after: Optional[str] = None) -> HTTPError:
+    headers = email.message.Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    return HTTPError("https://eodhd.test/api", code, "error", headers, io.BytesIO(b""))
+
+
+def http_date_in(seconds: float) -> str:
+    return format_datetime(datetime.now(timezone.utc) + timedelta(seconds=seconds), usegmt=True)
+
+
+class RetryDelaySecondsTest(unittest.TestCase):
+    def test_backoff_doubles_per_attempt_without_jitter(self) -> None:
+        with mock.patch.object(snapshot.random, "uniform", return_value=0.0):
+            delays = [snapshot.retry_delay_seconds(attempt) for attempt in range(1, 6)]
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 8.0, 16.0])
+
+    def test_jitter_stretches_the_delay(self) -> None:
+        with mock.patch.object(
+            snapshot.random, "uniform", return_value=snapshot.RETRY_JITTER_RATIO
+        ) as uniform:
+            self.assertEqual(snapshot.retry_delay_seconds(3), 6.0)
+        uniform.assert_called_once_with(0, snapshot.RETRY_JITTER_RATIO)
+
+    def test_delay_is_capped(self) -> None:
+        with mock.patch.object(
+            snapshot.random, "uniform", return_value=snapshot.RETRY_JITTER_RATIO
+        ):
+            self.assertEqual(snapshot.retry_delay_seconds(6), snapshot.RETRY_MAX_DELAY_SECONDS)
+            self.assertEqual(snapshot.retry_delay_seconds(20), snapshot.RETRY_MAX_DELAY_SECONDS)
+            self.assertEqual(
+                snapshot.retry_delay_seconds(1, retry_after=3600.0),
+                snapshot.RETRY_MAX_DELAY_SECONDS,
+            )
+
+    def test_longer_retry_after_wins(self) -> None:
+        with mock.patch.object(snapshot.random, "uniform", return_value=0.0):
+            self.assertEqual(snapshot.retry_delay_seconds(1, retry_after=12.0), 12.0)
+            self.assertEqual(snapshot.retry_delay_seconds(4, retry_after=2.0), 8.0)
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+    def test_delta_seconds(self) -> None:
+        self.assertEqual(snapshot.parse_retry_after("7"), 7.0)
+        self.assertEqual(snapshot.parse_retry_after("2.5"), 2.5)
+        self.assertEqual(snapshot.parse_retry_after("-3"), 0.0)
+
+    def test_http_date(self) -> None:
+        self.assertAlmostEqual(snapshot.parse_retry_after(http_date_in(20)), 20.0, delta=1.5)
+        self.assertEqual(snapshot.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_missing_or_malformed(self) -> None:
+        self.assertIsNone(snapshot.parse_retry_after(None))
+        self.assertIsNone(snapshot.parse_retry_after(""))
+        self.assertIsNone(snapshot.parse_retry_after("soon"))
+
+
+class FetchBulkLastDayRetryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sleep = self.patch(snapshot.time, "sleep")
+        self.patch(snapshot.random, "uniform", return_value=0.0)
+
+    def patch(self, target: object, name: str, **kwargs: object) -> mock.MagicMock:
+        patcher = mock.patch.object(target, name, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def fetch(self, responses: list[object], max_retries: int = 3) -> list[dict]:
+        self.http_get = self.patch(snapshot, "http_get", side_effect=responses)
+        return snapshot.fetch_bulk_last_day("secret-key", "US", 5, max_retries, LOGGER)
+
+    def sleeps(self) -> list[float]:
+        return [call.args[0] for call in self.sleep.call_args_list]
+
+    def test_server_errors_back_off_exponentially(self) -> None:
+        with self.assertRaises(RuntimeError) as ctx:
+            self.fetch([http_error(503), http_error(502), http_error(500)])
+        self.assertIn("after 3 attempts", str(ctx.exception))
+        self.assertEqual(self.http_get.call_count, 3)
+        self.assertEqual(self.sleeps(), [1.0, 2.0])
+
+    def test_recovers_after_a_transient_error(self) -> None:
+        rows = self.fetch([http_error(503), b'[{"code": "AAA"}, 7]'])
+        self.assertEqual(rows, [{"code": "AAA"}])
+        self.assertEqual(self.sleeps(), [1.0])
+
+    def test_429_honours_numeric_retry_after(self) -> None:
+        self.fetch([http_error(429, retry_after="7"), b"[]"])
+        self.assertEqual(self.sleeps(), [7.0])
+
+    def test_429_honours_http_date_retry_after(self) -> None:
+        self.fetch([http_error(429, retry_after=http_date_in(20)), b"[]"])
+        self.assertEqual(len(self.sleeps()), 1)
+        self.assertAlmostEqual(self.sleeps()[0], 20.0, delta=1.5)
+
+    def test_client_errors_fail_without_retrying(self) -> None:
+        for code in (400, 401, 403, 404):
+            with self.subTest(code=code):
+                self.sleep.reset_mock()
+                with self.assertRaises(RuntimeError) as ctx:
+                    self.fetch([http_error(code), b"[]"])
+                self.assertIn(f"status={code}", str(ctx.exception))
+                self.assertEqual(self.http_get.call_count, 1)
+                self.assertEqual(self.sleeps(), [])
+
+    def test_402_raises_payment_required(self) -> None:
+        with self.assertRaises(snapshot.PaymentRequiredError):
+            self.fetch([http_error(402), b"[]"])
+        self.assertEqual(self.http_get.call_count, 1)
+        self.assertEqual(self.sleeps(), [])
+
+
+class BuildPriceRowsTest(unittest.TestCase):
+    MARKET = snapshot.MarketDefinition(code="US", name="United States", default_currency="USD")
+
+    def build(self, records: list[dict]) -> list[snapshot.DailyPriceRow]:
+        return snapshot.build_price_rows(self.MARKET, records, "2026-03-05", LOGGER)
+
+    def test_unique_tickers_keep_payload_order(self) -> None:
+        rows = self.build([
+            {"code": "CCC", "close": 3},
+            {"code": "AAA", "close": 1},
+            {"code": "BBB", "close": 2},
+        ])
+        self.assertEqual([row.ticker for row in rows], ["CCC", "AAA", "BBB"])
+
+    def test_last_valid_duplicate_wins_in_first_seen_order(self) -> None:
+        records = [
+            {"code": "aaa", "close": "1.0", "name": "A first", "volume": 10},
+            {"code": "", "close": 5},
+            {"code": "BBB", "close": 2, "name": "B only"},
+            {"code": "AAA", "close": 0, "name": "A zero close"},
+            {"code": "CCC", "close": None},
+            {"code": "aaa ", "close": 3, "name": "A last", "date": "2026-03-04"},
+            {"code": "BBB", "close": "n/a", "name": "B invalid"},
+            {"symbol": "DDD", "close": 4},
+        ]
+        with self.assertLogs(LOGGER, level="INFO") as logs:
+            rows = self.build(records)
+
+        # Output follows each ticker's first valid record; values come from its last.
+        self.assertEqual([row.ticker for row in rows], ["AAA", "BBB", "DDD"])
+        aaa, bbb, ddd = rows
+        self.assertEqual(
+            (aaa.name, aaa.close, aaa.volume, aaa.as_of_date),
+            ("A last", 3.0, 0, "2026-03-04"),
+        )
+        self.assertEqual((bbb.name, bbb.close), ("B only", 2.0))
+        self.assertEqual((ddd.name, ddd.close, ddd.as_of_date), ("DDD", 4.0, "2026-03-05"))
+        self.assertEqual({row.market_code for row in rows}, {"US"})
+        self.assertEqual({row.currency for row in rows}, {"USD"})
+
+        summary = logs.output[-1]
+        self.assertIn("Valid unique: 3", summary)
+        self.assertIn("Skipped invalid: 3", summary)
+        self.assertIn("Skipped non-positive close: 1", summary)
+        self.assertIn("Duplicate tickers replaced: 1", summary)
+
+    def test_no_valid_rows_raises(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self.build([{"code": "AAA", "close": 0}, {"close": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()